@@ -1,11 +1,15 @@
 -- Healthcare Data Warehouse - Star Schema
 -- Created: January 2026
+--
+-- The ETL rebuilds this schema in a shadow schema on every reload: it runs the
+-- table section, bulk loads the data, then runs everything after the
+-- "@post-load" marker. Keep keys, constraints and indexes below that marker.
 
 -- Dimension Tables
 
 -- Patient Dimension
 CREATE TABLE dim_patient (
-    patient_id INT PRIMARY KEY,
+    patient_id INT,
     patient_name VARCHAR(100),
     age INT,
     gender VARCHAR(10),
@@ -14,14 +18,14 @@ CREATE TABLE dim_patient (
 
 -- Disease Dimension
 CREATE TABLE dim_disease (
-    disease_id SERIAL PRIMARY KEY,
-    medical_condition VARCHAR(100) UNIQUE
+    disease_id SERIAL,
+    medical_condition VARCHAR(100)
 );
 
 -- Time Dimension
 CREATE TABLE dim_time (
-    time_id SERIAL PRIMARY KEY,
-    admission_date DATE UNIQUE,
+    time_id SERIAL,
+    admission_date DATE,
     discharge_date DATE,
     month INT,
     year INT,
@@ -31,27 +35,27 @@ CREATE TABLE dim_time (
 
 -- Doctor Dimension
 CREATE TABLE dim_doctor (
-    doctor_id SERIAL PRIMARY KEY,
-    doctor_name VARCHAR(100) UNIQUE
+    doctor_id SERIAL,
+    doctor_name VARCHAR(100)
 );
 
 -- Hospital Dimension
 CREATE TABLE dim_hospital (
-    hospital_id SERIAL PRIMARY KEY,
-    hospital_name VARCHAR(100) UNIQUE
+    hospital_id SERIAL,
+    hospital_name VARCHAR(100)
 );
 
 -- Insurance Dimension
 CREATE TABLE dim_insurance (
-    insurance_id SERIAL PRIMARY KEY,
-    insurance_provider VARCHAR(100) UNIQUE
+    insurance_id SERIAL,
+    insurance_provider VARCHAR(100)
 );
 
 -- Fact Table
 
 -- Admissions Fact Table
 CREATE TABLE fact_admissions (
-    admission_id SERIAL PRIMARY KEY,
+    admission_id SERIAL,
     patient_id INT,
     disease_id INT,
     time_id INT,
@@ -62,15 +66,28 @@ CREATE TABLE fact_admissions (
     room_number INT,
     admission_type VARCHAR(50),
     medication VARCHAR(200),
-    test_results VARCHAR(50),
-    FOREIGN KEY (patient_id) REFERENCES dim_patient(patient_id),
-    FOREIGN KEY (disease_id) REFERENCES dim_disease(disease_id),
-    FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
-    FOREIGN KEY (doctor_id) REFERENCES dim_doctor(doctor_id),
-    FOREIGN KEY (hospital_id) REFERENCES dim_hospital(hospital_id),
-    FOREIGN KEY (insurance_id) REFERENCES dim_insurance(insurance_id)
+    test_results VARCHAR(50)
 );
 
+-- @post-load
+
+-- Keys and Constraints
+ALTER TABLE dim_patient ADD PRIMARY KEY (patient_id);
+ALTER TABLE dim_disease ADD PRIMARY KEY (disease_id), ADD UNIQUE (medical_condition);
+ALTER TABLE dim_time ADD PRIMARY KEY (time_id), ADD UNIQUE (admission_date);
+ALTER TABLE dim_doctor ADD PRIMARY KEY (doctor_id), ADD UNIQUE (doctor_name);
+ALTER TABLE dim_hospital ADD PRIMARY KEY (hospital_id), ADD UNIQUE (hospital_name);
+ALTER TABLE dim_insurance ADD PRIMARY KEY (insurance_id), ADD UNIQUE (insurance_provider);
+
+ALTER TABLE fact_admissions
+    ADD PRIMARY KEY (admission_id),
+    ADD FOREIGN KEY (patient_id) REFERENCES dim_patient(patient_id),
+    ADD FOREIGN KEY (disease_id) REFERENCES dim_disease(disease_id),
+    ADD FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
+    ADD FOREIGN KEY (doctor_id) REFERENCES dim_doctor(doctor_id),
+    ADD FOREIGN KEY (hospital_id) REFERENCES dim_hospital(hospital_id),
+    ADD FOREIGN KEY (insurance_id) REFERENCES dim_insurance(insurance_id);
+
 -- Create indexes for better query performance
 CREATE INDEX idx_fact_patient ON fact_admissions(patient_id);
 CREATE INDEX idx_fact_disease ON fact_admissions(disease_id);
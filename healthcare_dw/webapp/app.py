@@ -7,6 +7,7 @@ Features:
 - Instant table results
 - Automatic graph generation (Line, Bar, Pie charts)
 - Pre-built analysis templates
+- Pivot / drill-down API (ROLLUP, CUBE, GROUPING SETS) with cached subtotals
 """
 
 from flask import Flask, render_template, request, jsonify
@@ -15,8 +16,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from plotly.subplots import make_subplots
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text, bindparam
+from collections import OrderedDict
 import json
+import threading
+import time
 
 app = Flask(__name__)
 
@@ -139,10 +143,79 @@ LIMIT 15;''',
     }
 }
 
+# Dimension tables that pivot columns can be joined from
+PIVOT_JOINS = {
+    'p': 'JOIN dim_patient p ON f.patient_id = p.patient_id',
+    'd': 'JOIN dim_disease d ON f.disease_id = d.disease_id',
+    't': 'JOIN dim_time t ON f.time_id = t.time_id',
+    'doc': 'JOIN dim_doctor doc ON f.doctor_id = doc.doctor_id',
+    'h': 'JOIN dim_hospital h ON f.hospital_id = h.hospital_id',
+    'i': 'JOIN dim_insurance i ON f.insurance_id = i.insurance_id'
+}
+
+# Whitelisted pivot dimensions: name -> (SQL expression, required join)
+PIVOT_DIMENSIONS = {
+    'year': ('t.year', 't'),
+    'quarter': ('t.quarter', 't'),
+    'month': ('t.month', 't'),
+    'medical_condition': ('d.medical_condition', 'd'),
+    'hospital_name': ('h.hospital_name', 'h'),
+    'doctor_name': ('doc.doctor_name', 'doc'),
+    'insurance_provider': ('i.insurance_provider', 'i'),
+    'gender': ('p.gender', 'p'),
+    'blood_type': ('p.blood_type', 'p'),
+    'admission_type': ('f.admission_type', None),
+    'medication': ('f.medication', None),
+    'test_results': ('f.test_results', None)
+}
+
+# Whitelisted pivot measures: name -> (SQL aggregate, required join)
+PIVOT_MEASURES = {
+    'admissions': ('COUNT(*)', None),
+    'revenue': ('SUM(f.billing_amount)', None),
+    'avg_billing': ('AVG(f.billing_amount)', None),
+    'patients': ('COUNT(DISTINCT f.patient_id)', None),
+    'avg_age': ('AVG(p.age)', 'p')
+}
+
+PIVOT_MODES = ('rollup', 'cube', 'grouping_sets')
+
+# Drill-down hierarchies offered in the UI
+PIVOT_HIERARCHIES = {
+    'time': {
+        'name': '📅 Year → Quarter → Month',
+        'dimensions': ['year', 'quarter', 'month']
+    },
+    'condition_hospital': {
+        'name': '🦠 Condition → Hospital',
+        'dimensions': ['medical_condition', 'hospital_name']
+    },
+    'insurance_condition': {
+        'name': '💼 Insurance → Condition → Admission Type',
+        'dimensions': ['insurance_provider', 'medical_condition', 'admission_type']
+    },
+    'condition_time': {
+        'name': '📈 Condition → Year → Quarter',
+        'dimensions': ['medical_condition', 'year', 'quarter']
+    }
+}
+
+# Computed pivots keyed by request, so drilling into a level is served from memory
+PIVOT_CACHE = OrderedDict()
+PIVOT_CACHE_SIZE = 64
+PIVOT_CACHE_TTL = 300  # seconds
+PIVOT_CACHE_LOCK = threading.Lock()
+
+# How often the live fact table is checked for a reload (see get_warehouse_version)
+WAREHOUSE_VERSION_TTL = 5  # seconds
+WAREHOUSE_VERSION = {'checked_at': 0.0, 'version': None}
+
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template('index.html', templates=QUERY_TEMPLATES)
+    return render_template(
+        'index.html', templates=QUERY_TEMPLATES, pivot_hierarchies=PIVOT_HIERARCHIES
+    )
 
 @app.route('/execute_query', methods=['POST'])
 def execute_query():
@@ -185,6 +258,170 @@ def execute_query():
             'traceback': traceback.format_exc()
         })
 
+def build_pivot_query(dimensions, measures, filters, mode, grouping_sets):
+    """Build one GROUPING SETS / ROLLUP / CUBE query covering every requested level"""
+    joins = set()
+    
+    dim_exprs = []
+    for dim in dimensions:
+        expr, join = PIVOT_DIMENSIONS[dim]
+        dim_exprs.append(expr)
+        if join:
+            joins.add(join)
+    
+    select_parts = [f"{expr} AS {dim}" for dim, expr in zip(dimensions, dim_exprs)]
+    for measure in measures:
+        expr, join = PIVOT_MEASURES[measure]
+        select_parts.append(f"{expr} AS {measure}")
+        if join:
+            joins.add(join)
+    
+    # Bit i (from the left) is set when dimension i is rolled up in that row
+    select_parts.append(f"GROUPING({', '.join(dim_exprs)}) AS grouping_id")
+    
+    where_parts = []
+    params = {}
+    bind_params = []
+    for n, (dim, values) in enumerate(filters.items()):
+        expr, join = PIVOT_DIMENSIONS[dim]
+        if join:
+            joins.add(join)
+        where_parts.append(f"{expr} IN :filter_{n}")
+        params[f"filter_{n}"] = list(values)
+        bind_params.append(bindparam(f"filter_{n}", expanding=True))
+    
+    if mode == 'rollup':
+        group_by = f"ROLLUP ({', '.join(dim_exprs)})"
+    elif mode == 'cube':
+        group_by = f"CUBE ({', '.join(dim_exprs)})"
+    else:
+        sets = [
+            '(' + ', '.join(PIVOT_DIMENSIONS[dim][0] for dim in grouping_set) + ')'
+            for grouping_set in grouping_sets
+        ]
+        group_by = f"GROUPING SETS ({', '.join(sets)})"
+    
+    sql = "SELECT \n    " + ",\n    ".join(select_parts) + "\nFROM fact_admissions f"
+    for alias in PIVOT_JOINS:
+        if alias in joins:
+            sql += "\n" + PIVOT_JOINS[alias]
+    if where_parts:
+        sql += "\nWHERE " + "\n  AND ".join(where_parts)
+    sql += f"\nGROUP BY {group_by}"
+    sql += "\nORDER BY " + ", ".join(f"{expr} NULLS FIRST" for expr in dim_exprs)
+    
+    query = text(sql)
+    if bind_params:
+        query = query.bindparams(*bind_params)
+    return query, params
+
+def grouping_mask(dimensions, level):
+    """GROUPING() value for rows grouped by exactly the dimensions in level"""
+    return sum(
+        1 << (len(dimensions) - 1 - n)
+        for n, dim in enumerate(dimensions)
+        if dim not in level
+    )
+
+def get_warehouse_version():
+    """Storage file of the live fact table; changes whenever the ETL reloads it"""
+    with PIVOT_CACHE_LOCK:
+        if time.time() - WAREHOUSE_VERSION['checked_at'] < WAREHOUSE_VERSION_TTL:
+            return WAREHOUSE_VERSION['version']
+    
+    # Checked at most once per WAREHOUSE_VERSION_TTL, not on every pivot request
+    with engine.connect() as conn:
+        version = conn.execute(text("SELECT pg_relation_filenode('fact_admissions')")).scalar()
+    
+    with PIVOT_CACHE_LOCK:
+        WAREHOUSE_VERSION['checked_at'] = time.time()
+        WAREHOUSE_VERSION['version'] = version
+    return version
+
+def get_pivot(dimensions, measures, filters, mode, grouping_sets):
+    """Return all pivot levels, computing them in a single pass on a cache miss"""
+    # Keyed on the warehouse version so a reload never serves stale subtotals
+    cache_key = json.dumps(
+        [get_warehouse_version(), dimensions, measures, filters, mode, grouping_sets],
+        sort_keys=True, default=str
+    )
+    
+    with PIVOT_CACHE_LOCK:
+        cached = PIVOT_CACHE.get(cache_key)
+        if cached and time.time() - cached[0] < PIVOT_CACHE_TTL:
+            PIVOT_CACHE.move_to_end(cache_key)
+            return cached[1], True
+    
+    query, params = build_pivot_query(dimensions, measures, filters, mode, grouping_sets)
+    df = pd.read_sql(query, engine, params=params)
+    
+    # Subtotal rows hold NULL dimensions, which turn integer columns into floats
+    for dim in dimensions:
+        if df[dim].dtype.kind == 'f':
+            df[dim] = df[dim].astype('Int64')
+    
+    with PIVOT_CACHE_LOCK:
+        PIVOT_CACHE[cache_key] = (time.time(), df)
+        PIVOT_CACHE.move_to_end(cache_key)
+        while len(PIVOT_CACHE) > PIVOT_CACHE_SIZE:
+            PIVOT_CACHE.popitem(last=False)
+    
+    return df, False
+
+@app.route('/pivot', methods=['POST'])
+def pivot():
+    """Roll-up / drill-down / slice / pivot over fact_admissions"""
+    try:
+        data = request.json
+        dimensions = data.get('dimensions', [])
+        measures = data.get('measures', ['admissions'])
+        filters = data.get('filters', {})
+        mode = data.get('mode', 'rollup')
+        grouping_sets = data.get('grouping_sets', [])
+        level = data.get('level')
+        
+        # Validate against the whitelists (values are still bound as parameters)
+        if not dimensions:
+            return jsonify({'success': False, 'error': 'At least one dimension is required'})
+        unknown = [dim for dim in dimensions + list(filters) if dim not in PIVOT_DIMENSIONS]
+        unknown += [m for m in measures if m not in PIVOT_MEASURES]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown dimensions/measures: {', '.join(unknown)}"})
+        if mode not in PIVOT_MODES:
+            return jsonify({'success': False, 'error': f"Mode must be one of: {', '.join(PIVOT_MODES)}"})
+        if mode == 'grouping_sets':
+            used = {dim for grouping_set in grouping_sets for dim in grouping_set}
+            if not grouping_sets or used != set(dimensions):
+                return jsonify({'success': False, 'error': 'grouping_sets must be subsets of dimensions that together use every dimension'})
+        if any(not isinstance(values, list) or not values for values in filters.values()):
+            return jsonify({'success': False, 'error': 'Filters must map a dimension to a non-empty list of values'})
+        
+        df, cached = get_pivot(dimensions, measures, filters, mode, grouping_sets)
+        
+        # Optionally return a single level (e.g. the children being expanded)
+        if level is not None:
+            if any(dim not in dimensions for dim in level):
+                return jsonify({'success': False, 'error': 'level must be a subset of dimensions'})
+            df = df[df['grouping_id'] == grouping_mask(dimensions, level)]
+        
+        df = df.astype(object).where(df.notna(), None)
+        
+        return jsonify({
+            'success': True,
+            'columns': df.columns.tolist(),
+            'data': df.to_dict('records'),
+            'row_count': len(df),
+            'cached': cached
+        })
+        
+    except Exception as e:
+        import traceback
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        })
+
 def generate_chart(df, chart_type='auto'):
     """Generate appropriate chart based on data"""
     
@@ -447,5 +684,6 @@ if __name__ == '__main__':
     print("   • Instant table results")
     print("   • Automatic graph generation")
     print("   • Pre-built analysis templates")
+    print("   • Pivot / drill-down API (POST /pivot)")
     print("\n" + "=" * 80)
     app.run(debug=True, host='0.0.0.0', port=5000)